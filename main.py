@@ -2,6 +2,10 @@ import string
 import argparse
 import random
 import re
+import os
+import json
+import timeit
+import functools
 
 # Default cipher parameters
 DEFAULT_VIGENERE_KEY = "BUTTERFLY"
@@ -71,6 +75,23 @@ def caesar_decode(text: str, shift: int = DEFAULT_CAESAR_SHIFT, **kwargs) -> str
         shifted_text.append(shifted_char)
     return "".join(shifted_text)
 
+CAESAR_TABLES = [
+    str.maketrans(
+        string.ascii_lowercase + string.ascii_uppercase,
+        string.ascii_lowercase[shift:] + string.ascii_lowercase[:shift]
+        + string.ascii_uppercase[shift:] + string.ascii_uppercase[:shift],
+    )
+    for shift in range(26)
+]
+
+def caesar_encode_table(text: str, shift: int = DEFAULT_CAESAR_SHIFT, **kwargs) -> str:
+    """Encodes text with the Caesar cipher using a precomputed str.translate table."""
+    return text.translate(CAESAR_TABLES[shift % 26])
+
+def caesar_decode_table(text: str, shift: int = DEFAULT_CAESAR_SHIFT, **kwargs) -> str:
+    """Decodes Caesar-shifted text using a str.translate table."""
+    return caesar_encode_table(text, -shift)
+
 def ascii_encode(text: str, **kwargs) -> str:
     """Encodes text by replacing each character with its ASCII code, separated by spaces."""
     ascii_codes = [str(ord(char)) for char in text]
@@ -100,6 +121,19 @@ def atbash_decode(text: str, **kwargs) -> str:
     """Decodes text using the Atbash cipher. This is the same as encoding."""
     return atbash_encode(text)
 
+ATBASH_TABLE = str.maketrans(
+    string.ascii_lowercase + string.ascii_uppercase,
+    string.ascii_lowercase[::-1] + string.ascii_uppercase[::-1],
+)
+
+def atbash_encode_table(text: str, **kwargs) -> str:
+    """Encodes text with the Atbash cipher using a precomputed str.translate table."""
+    return text.translate(ATBASH_TABLE)
+
+def atbash_decode_table(text: str, **kwargs) -> str:
+    """Decodes text using the Atbash translate table. This is the same as encoding."""
+    return atbash_encode_table(text)
+
 def vigenere_encode(text: str, key: str) -> str:
     """Encodes text using the Vigenere cipher with the given key."""
     encoded_chars = []
@@ -418,18 +452,340 @@ ciphers = {
     }
 }
 
+# Alternative implementations ("engines") of some ciphers. The "loop" engine is
+# always the reference implementation registered in `ciphers`; every other
+# engine must produce exactly the same output.
+DEFAULT_ENGINE = "loop"
+CIPHER_ENGINES = {
+    "caesar": {
+        "table": {"encode": caesar_encode_table, "decode": caesar_decode_table},
+    },
+    "atbash": {
+        "table": {"encode": atbash_encode_table, "decode": atbash_decode_table},
+    },
+}
+# Engine used when there is no calibrated profile. The table engines were the fastest at
+# every calibrated size, so there is no size crossover to fall back to.
+UNCALIBRATED_ENGINES = {
+    "caesar": "table",
+    "atbash": "table",
+}
+ENGINE_CHOICES = ["auto", DEFAULT_ENGINE] + sorted({name for engines in CIPHER_ENGINES.values() for name in engines})
+
+# Engine calibration settings
+ENGINE_PROFILE_VERSION = 1
+ENGINE_PROFILE_PATH = os.environ.get(
+    "THREE_MINDS_ENGINE_PROFILE",
+    os.path.join(os.path.expanduser("~"), ".three_minds_engines.json"),
+)
+CALIBRATION_SIZES = [8, 32, 128, 512, 2048, 8192]
+CALIBRATION_REPEATS = 5
+CALIBRATION_CHARS_PER_RUN = 4096
+CALIBRATION_SAMPLE = "Hello, World! 123 This is a test. "
+
+pinned_engine = None  # Set with pin_engine() to bypass the autotuner
+engine_profile = None  # Loaded lazily by get_engine_profile()
+engine_profile_loaded = False
+
+def pin_engine(engine: str | None) -> None:
+    """Forces every cipher to use the given engine. Ciphers without that engine use the loop engine.
+    Passing None or 'auto' restores automatic engine selection."""
+    global pinned_engine
+    if engine is not None and engine not in ENGINE_CHOICES:
+        raise ValueError(f"Unknown engine: {engine}")
+    pinned_engine = None if engine in (None, "auto") else engine
+
+def get_engine_function(cipher_type: str, direction: str, engine: str):
+    """Returns the encode or decode function of the given engine for a cipher."""
+    if engine == DEFAULT_ENGINE:
+        return ciphers[cipher_type][direction]
+    return CIPHER_ENGINES[cipher_type][engine][direction]
+
+def calibrate_engines(sizes: list[int] = CALIBRATION_SIZES, repeats: int = CALIBRATION_REPEATS) -> dict:
+    """Micro-benchmarks every engine of every cipher on sample texts of the given sizes.
+    Returns the crossover thresholds as {cipher: {direction: [[min_length, engine], ...]}},
+    sorted by min_length, where each engine is the fastest from its min_length upwards."""
+    thresholds = {}
+    for cipher_type in CIPHER_ENGINES:
+        engine_names = [DEFAULT_ENGINE] + list(CIPHER_ENGINES[cipher_type])
+        thresholds[cipher_type] = {}
+        for direction in ("encode", "decode"):
+            crossovers = []
+            for size in sizes:
+                sample = (CALIBRATION_SAMPLE * (size // len(CALIBRATION_SAMPLE) + 1))[:size]
+                number = max(1, CALIBRATION_CHARS_PER_RUN // size)
+                timings = {}
+                for engine in engine_names:
+                    func = functools.partial(get_engine_function(cipher_type, direction, engine), sample)
+                    timings[engine] = min(timeit.repeat(func, number=number, repeat=repeats))
+                fastest = min(engine_names, key=timings.get)
+                if not crossovers:
+                    crossovers.append([0, fastest])
+                elif crossovers[-1][1] != fastest:
+                    crossovers.append([size, fastest])
+            thresholds[cipher_type][direction] = crossovers
+    return thresholds
+
+def load_engine_profile(path: str = ENGINE_PROFILE_PATH) -> dict | None:
+    """Loads saved engine thresholds. Returns None if the profile is missing, unreadable or outdated."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            profile = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(profile, dict) or profile.get("version") != ENGINE_PROFILE_VERSION:
+        return None
+    thresholds = profile.get("thresholds")
+    if not is_valid_engine_thresholds(thresholds):
+        return None
+    return thresholds
+
+def is_valid_engine_thresholds(thresholds) -> bool:
+    """Checks that thresholds have the shape produced by calibrate_engines: for every cipher in
+    CIPHER_ENGINES, an 'encode' and a 'decode' list of [min_length, engine] pairs starting at 0,
+    sorted by min_length and naming only engines available for that cipher."""
+    if not isinstance(thresholds, dict) or set(thresholds) != set(CIPHER_ENGINES):
+        return False
+    for cipher_type, directions in thresholds.items():
+        available = {DEFAULT_ENGINE, *CIPHER_ENGINES[cipher_type]}
+        if not isinstance(directions, dict) or set(directions) != {"encode", "decode"}:
+            return False
+        for crossovers in directions.values():
+            if not isinstance(crossovers, list) or not crossovers:
+                return False
+            previous = -1
+            for pair in crossovers:
+                if not isinstance(pair, list) or len(pair) != 2:
+                    return False
+                min_length, engine = pair
+                if type(min_length) is not int or min_length <= previous or engine not in available:
+                    return False
+                previous = min_length
+            if crossovers[0][0] != 0:
+                return False
+    return True
+
+def save_engine_profile(thresholds: dict, path: str = ENGINE_PROFILE_PATH) -> bool:
+    """Saves engine thresholds to disk. Returns False if the profile could not be written."""
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"version": ENGINE_PROFILE_VERSION, "thresholds": thresholds}, f, indent=2)
+    except OSError:
+        return False
+    return True
+
+def get_engine_profile() -> dict | None:
+    """Returns the saved engine thresholds for this machine, or None if there are none yet.
+    Never runs the calibration; see calibrate_engine_profile()."""
+    global engine_profile, engine_profile_loaded
+    if not engine_profile_loaded:
+        engine_profile = load_engine_profile()
+        engine_profile_loaded = True
+    return engine_profile
+
+def calibrate_engine_profile(recalibrate: bool = False) -> dict:
+    """Returns the engine thresholds, running the calibration and saving its result
+    if there is no valid saved profile yet or if recalibrate is set."""
+    global engine_profile, engine_profile_loaded
+    if not recalibrate and get_engine_profile() is not None:
+        return engine_profile
+    engine_profile = calibrate_engines()
+    engine_profile_loaded = True
+    save_engine_profile(engine_profile)
+    return engine_profile
+
+def select_engine(cipher_type: str, direction: str, length: int) -> str:
+    """Picks the engine to use for a cipher and input length, honouring a pinned engine."""
+    available = CIPHER_ENGINES.get(cipher_type)
+    if not available:
+        return DEFAULT_ENGINE
+    if pinned_engine is not None:
+        return pinned_engine if pinned_engine in available else DEFAULT_ENGINE
+
+    thresholds = get_engine_profile()
+    if thresholds is None:
+        return UNCALIBRATED_ENGINES.get(cipher_type, DEFAULT_ENGINE)
+
+    engine = DEFAULT_ENGINE
+    for min_length, candidate in thresholds[cipher_type][direction]:
+        if length >= min_length:
+            engine = candidate
+    return engine if engine in available else DEFAULT_ENGINE
+
+def print_engine_thresholds() -> None:
+    """Prints the engine crossover thresholds used by encode_text/decode_text."""
+    thresholds = get_engine_profile()
+    print(f"Engine profile: {ENGINE_PROFILE_PATH}")
+    print(f"Pinned engine: {pinned_engine or 'none (auto)'}")
+    if thresholds is None:
+        print("\nNot calibrated yet, using the default engines:")
+        for cipher_type in sorted(CIPHER_ENGINES):
+            print(f"  {cipher_type}: {UNCALIBRATED_ENGINES.get(cipher_type, DEFAULT_ENGINE)}")
+        return
+    for cipher_type in sorted(thresholds):
+        print(f"\n{ciphers[cipher_type]['name']} ({cipher_type}):")
+        for direction in ("encode", "decode"):
+            ranges = ", ".join(f"{engine} for length >= {min_length}" for min_length, engine in thresholds[cipher_type][direction])
+            print(f"  {direction}: {ranges}")
+    others = sorted(set(ciphers) - set(thresholds))
+    print(f"\nNo alternative engines: {', '.join(others)}")
+
 def encode_text(cipher_type: str, text: str, **kwargs) -> str:
     if cipher_type in ciphers:
-        return ciphers[cipher_type]["encode"](text, **kwargs)
+        engine = select_engine(cipher_type, "encode", len(text))
+        return get_engine_function(cipher_type, "encode", engine)(text, **kwargs)
     else:
         raise ValueError(f"Unknown cipher type: {cipher_type}")
 
 def decode_text(cipher_type: str, text: str, **kwargs) -> str:
     if cipher_type in ciphers:
-        return ciphers[cipher_type]["decode"](text, **kwargs)
+        engine = select_engine(cipher_type, "decode", len(text))
+        return get_engine_function(cipher_type, "decode", engine)(text, **kwargs)
     else:
         raise ValueError(f"Unknown cipher type: {cipher_type}")
 
+# Ciphers that only reorder characters. In a chain they are applied lazily on a
+# ReversalView instead of building a reversed copy of the text at every step.
+LAZY_REVERSAL_CIPHERS = {"reverse_capitalize", "reverse_word_order", "reverse_chars_in_words"}
+
+class ReversalView:
+    """A lazily reversed view over a source string.
+
+    The text is the source split on single spaces, with the word order and/or the
+    characters inside each word reversed. Reversing the whole string is the same as
+    reversing both. Pending capitalizations are stored as indices into the source so
+    they follow their characters through later reversals. Views are immutable; each
+    operation returns a new view in O(1) and the text is only built by str().
+    """
+
+    def __init__(self, source: str, words_reversed: bool = False, chars_reversed: bool = False,
+                 capitalized: frozenset = frozenset()):
+        self.source = source
+        self.words_reversed = words_reversed
+        self.chars_reversed = chars_reversed
+        self.capitalized = capitalized
+        self._text = None
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = self.materialize()
+        return self._text
+
+    def __repr__(self) -> str:
+        return (f"ReversalView({self.source!r}, words_reversed={self.words_reversed}, "
+                f"chars_reversed={self.chars_reversed}, capitalized={set(self.capitalized)})")
+
+    def materialize(self) -> str:
+        """Builds the concrete text of the view."""
+        source = self.source
+        if self.capitalized:
+            chars = list(source)
+            for index in self.capitalized:
+                chars[index] = chars[index].upper()
+            source = "".join(chars)
+
+        if self.words_reversed and self.chars_reversed:
+            return source[::-1]
+        if self.words_reversed:
+            return " ".join(source.split(' ')[::-1])
+        if self.chars_reversed:
+            return " ".join(word[::-1] for word in source.split(' '))
+        return source
+
+    def first_index(self) -> int | None:
+        """Returns the source index of the first character of the text.
+        Returns None if the text is empty or starts with a space."""
+        if self.words_reversed:
+            start = self.source.rfind(' ') + 1
+            end = len(self.source)
+        else:
+            start = 0
+            end = self.source.find(' ')
+            if end == -1:
+                end = len(self.source)
+        if start == end:
+            return None
+        return end - 1 if self.chars_reversed else start
+
+    def reverse(self) -> "ReversalView":
+        """Reverses the entire string."""
+        return ReversalView(self.source, not self.words_reversed, not self.chars_reversed, self.capitalized)
+
+    def reverse_words(self) -> "ReversalView":
+        """Reverses the order of the space-separated words."""
+        return ReversalView(self.source, not self.words_reversed, self.chars_reversed, self.capitalized)
+
+    def reverse_chars_in_words(self) -> "ReversalView":
+        """Reverses the characters within each space-separated word."""
+        return ReversalView(self.source, self.words_reversed, not self.chars_reversed, self.capitalized)
+
+    def capitalize_first(self) -> "ReversalView":
+        """Capitalizes the first character while preserving the case of the others."""
+        index = self.first_index()
+        if index is None:
+            return self
+        if len(self.source[index].upper()) != 1:
+            # Uppercasing changes the length (e.g. 'ß' -> 'SS'), so source indices would
+            # no longer line up. Start a new view over the concrete text instead.
+            text = str(self)
+            return ReversalView(text[0].upper() + text[1:])
+        return ReversalView(self.source, self.words_reversed, self.chars_reversed, self.capitalized | {index})
+
+class CipherChainError(Exception):
+    """Raised by run_cipher_chain when a step fails.
+    Records the 1-based step number, the cipher key and the text before the failing step."""
+
+    def __init__(self, step: int, cipher_key: str, text: str, error: Exception):
+        super().__init__(str(error))
+        self.step = step
+        self.cipher_key = cipher_key
+        self.text = text
+        self.error = error
+
+def apply_cipher_step(cipher_key: str, text, decode: bool = False, **kwargs):
+    """Applies one step of a cipher chain to text, which may be a str or a ReversalView.
+    Reversal ciphers return a ReversalView; every other cipher materializes the text and returns a str.
+    For word_replacement encoding, kwargs must contain a 'replacements' dictionary, which is updated
+    in place so the mapping can be used for decoding."""
+    if cipher_key in LAZY_REVERSAL_CIPHERS:
+        view = text if isinstance(text, ReversalView) else ReversalView(text)
+        if cipher_key == "reverse_capitalize":
+            return view.reverse().capitalize_first()
+        elif cipher_key == "reverse_word_order":
+            return view.reverse_words()
+        else:
+            return view.reverse_chars_in_words()
+
+    text = str(text)
+    if decode:
+        return decode_text(cipher_key, text, **kwargs)
+    if cipher_key == "word_replacement":
+        if not isinstance(kwargs.get("replacements"), dict):
+            raise ValueError("No replacement dictionary provided to record the mapping for decoding")
+        encoded_text, _ = word_replacement_encode(text, **kwargs)
+        return encoded_text
+    return encode_text(cipher_key, text, **kwargs)
+
+def run_cipher_chain(text: str, steps: list[tuple[str, dict]], decode: bool = False, on_step=None) -> str:
+    """Applies a sequence of (cipher_key, kwargs) steps to text in the given order.
+    Runs of reversal ciphers are applied lazily and the text is only built when needed.
+    If on_step is given, it is called as on_step(step_number, cipher_key, text) after every
+    step, which builds the intermediate text at each step.
+    Raises CipherChainError if a step fails."""
+    current_text = text
+    for i, (cipher_key, kwargs) in enumerate(steps, 1):
+        try:
+            current_text = apply_cipher_step(cipher_key, current_text, decode=decode, **kwargs)
+        except Exception as e:
+            raise CipherChainError(i, cipher_key, str(current_text), e) from e
+        if on_step is not None:
+            current_text = str(current_text)
+            on_step(i, cipher_key, current_text)
+    return str(current_text)
+
 def get_cipher_params(cipher_key: str) -> dict:
     if cipher_key == "vigenere":
         print(f"Enter the Vigenère cipher key (or press Enter to use default: '{DEFAULT_VIGENERE_KEY}'):")
@@ -501,9 +857,25 @@ if __name__ == "__main__":
     parser.add_argument('--num-ciphers', '-n',
                        type=int,
                        help='Number of ciphers to apply. Used with --random or to limit manually specified ciphers.')
+    parser.add_argument('--engine', '-e',
+                       choices=ENGINE_CHOICES,
+                       default='auto',
+                       help='Cipher engine to use. "auto" picks the fastest engine per cipher and input size (default: auto).')
+    parser.add_argument('--show-engines',
+                       action='store_true',
+                       help='Print the engine thresholds chosen for this machine and exit.')
+    parser.add_argument('--calibrate',
+                       action='store_true',
+                       help='Re-run the engine benchmark, save the new thresholds, print them and exit.')
 
     args = parser.parse_args()
 
+    pin_engine(args.engine)
+    if args.calibrate or args.show_engines:
+        calibrate_engine_profile(recalibrate=args.calibrate)
+        print_engine_thresholds()
+        raise SystemExit(0)
+
     selected_ciphers_from_args = args.ciphers or []
     num_ciphers_from_args = len(selected_ciphers_from_args)
 
@@ -561,6 +933,10 @@ if __name__ == "__main__":
     if n > 0 and not selected_ciphers:
         parser.error("No ciphers were selected. Please check your arguments.")
 
+    # Calibrate the engines on the first run, once the selection is known to be valid
+    if args.engine == "auto" and any(cipher_key in CIPHER_ENGINES for cipher_key in selected_ciphers):
+        calibrate_engine_profile()
+
     # Print selected ciphers
     for i, cipher_key in enumerate(selected_ciphers, 1):
         cipher_info = ciphers[cipher_key]
@@ -574,11 +950,12 @@ if __name__ == "__main__":
     # Store parameters used for each cipher
     cipher_params = {}
     word_replacements = {}  # Store word replacements for decoding
+    encode_steps = []
 
     # Get parameters for each cipher if needed
     for i, cipher_key in enumerate(selected_ciphers, 1):
         cipher_info = ciphers[cipher_key]
-        print(f"\nStep {i}: Applying {cipher_info['name']}")
+        print(f"\nStep {i}: {cipher_info['name']}")
 
         # Get parameters if needed and store them
         kwargs = get_cipher_params(cipher_key)
@@ -611,17 +988,18 @@ if __name__ == "__main__":
             current_description = cipher_info['description']
         print(f"Description: {current_description}")
 
-        # Apply cipher
-        try:
-            if cipher_key == "word_replacement":
-                current_text, word_replacements = word_replacement_encode(current_text, replacements=word_replacements)
-                cipher_params[cipher_key]['replacements'] = word_replacements
-            else:
-                current_text = encode_text(cipher_key, current_text, **kwargs)
-            print(f"Result: '{current_text}'")
-        except Exception as e:
-            print(f"Error applying cipher: {e}")
-            break
+        encode_steps.append((cipher_key, kwargs))
+
+    def print_encode_step(i, cipher_key, text):
+        print(f"\nResult of step {i} ({ciphers[cipher_key]['name']}): '{text}'")
+
+    # Apply ciphers (word_replacement fills its kwargs['replacements'] in place)
+    try:
+        current_text = run_cipher_chain(current_text, encode_steps,
+                                        on_step=print_encode_step)
+    except CipherChainError as e:
+        print(f"Error applying cipher: {e}")
+        current_text = e.text
 
     print(f"\nFinal encoded text: '{current_text}'")
 
@@ -666,22 +1044,21 @@ if __name__ == "__main__":
     text_to_decode = current_text # Start with the final encoded text
     print(f"Starting with encoded text: '{text_to_decode}'")
 
-    # Iterate through ciphers in reverse order of application for decoding
-    for i, cipher_key in enumerate(selected_ciphers[::-1], 1):
-        cipher_info = ciphers[cipher_key]
-        print(f"\nDecoding Step {i}: Applying {cipher_info['name']} (decode)")
+    # Apply the ciphers in reverse order of application, with the parameters used during encoding
+    decode_steps = [(cipher_key, cipher_params.get(cipher_key, {})) for cipher_key in selected_ciphers[::-1]]
 
-        # Get parameters used during encoding for this cipher
-        # Ensure word_replacement gets its specific 'replacements' dictionary
-        current_cipher_params = cipher_params.get(cipher_key, {})
+    def print_decode_step(i, cipher_key, text):
+        print(f"\nDecoding Step {i}: Applying {ciphers[cipher_key]['name']} (decode)")
+        print(f"Result after decoding: '{text}'")
 
-        try:
-            text_to_decode = decode_text(cipher_key, text_to_decode, **current_cipher_params)
-            print(f"Result after decoding: '{text_to_decode}'")
-        except Exception as e:
-            print(f"Error decoding with {cipher_info['name']}: {e}")
-            print("Halting decoding verification.")
-            break
+    try:
+        text_to_decode = run_cipher_chain(text_to_decode, decode_steps, decode=True,
+                                          on_step=print_decode_step)
+    except CipherChainError as e:
+        print(f"\nDecoding Step {e.step}: Applying {ciphers[e.cipher_key]['name']} (decode)")
+        print(f"Error decoding with {ciphers[e.cipher_key]['name']}: {e}")
+        print("Halting decoding verification.")
+        text_to_decode = e.text
 
     print(f"\nFinal decoded text: '{text_to_decode}'")
     if text_to_decode == args.text:
@@ -0,0 +1,193 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+import main
+
+
+class EngineEquivalenceTest(unittest.TestCase):
+    SAMPLES = ["", "Hello, World! 123 This is a test.", "abcxyz ABCXYZ", "éß ǆ\n\t~{}[]@`"]
+
+    def test_caesar_table_matches_loop(self):
+        for shift in range(-25, 26):
+            for text in self.SAMPLES:
+                with self.subTest(shift=shift, text=text):
+                    self.assertEqual(main.caesar_encode_table(text, shift), main.caesar_encode(text, shift))
+                    self.assertEqual(main.caesar_decode_table(text, shift), main.caesar_decode(text, shift))
+
+    def test_atbash_table_matches_loop(self):
+        for text in self.SAMPLES:
+            self.assertEqual(main.atbash_encode_table(text), main.atbash_encode(text))
+            self.assertEqual(main.atbash_decode_table(text), main.atbash_decode(text))
+
+
+class EngineProfileTest(unittest.TestCase):
+    def setUp(self):
+        self.saved_profile = main.engine_profile
+        self.saved_loaded = main.engine_profile_loaded
+        self.saved_pinned = main.pinned_engine
+        main.engine_profile_loaded = True
+        main.pin_engine(None)
+
+    def tearDown(self):
+        main.engine_profile = self.saved_profile
+        main.engine_profile_loaded = self.saved_loaded
+        main.pinned_engine = self.saved_pinned
+
+    def valid_thresholds(self):
+        return {
+            cipher_type: {"encode": [[0, "loop"], [32, "table"]], "decode": [[0, "table"]]}
+            for cipher_type in main.CIPHER_ENGINES
+        }
+
+    def load(self, thresholds):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "engines.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"version": main.ENGINE_PROFILE_VERSION, "thresholds": thresholds}, f)
+            return main.load_engine_profile(path)
+
+    def test_load_valid_profile(self):
+        thresholds = self.valid_thresholds()
+        self.assertEqual(self.load(thresholds), thresholds)
+
+    def test_load_rejects_malformed_profiles(self):
+        bad_entries = [
+            {},
+            {"encode": [[0, "loop"]]},
+            {"encode": [["x", "table"]], "decode": [[0, "loop"]]},
+            {"encode": [[0, "loop"], [0, "table"]], "decode": [[0, "loop"]]},
+            {"encode": [[32, "table"]], "decode": [[0, "loop"]]},
+            {"encode": [[0, "simd"]], "decode": [[0, "loop"]]},
+            {"encode": [], "decode": [[0, "loop"]]},
+        ]
+        for entry in bad_entries:
+            thresholds = self.valid_thresholds()
+            thresholds["caesar"] = entry
+            with self.subTest(entry=entry):
+                self.assertIsNone(self.load(thresholds))
+
+    def test_select_engine_uses_thresholds(self):
+        main.engine_profile = self.valid_thresholds()
+        self.assertEqual(main.select_engine("caesar", "encode", 5), "loop")
+        self.assertEqual(main.select_engine("caesar", "encode", 32), "table")
+        self.assertEqual(main.select_engine("vigenere", "encode", 1000), "loop")
+
+    def test_calibrated_profile_round_trips(self):
+        thresholds = main.calibrate_engines(sizes=[8, 64], repeats=1)
+        self.assertTrue(main.is_valid_engine_thresholds(thresholds))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "engines.json")
+            self.assertTrue(main.save_engine_profile(thresholds, path))
+            loaded = main.load_engine_profile(path)
+        self.assertEqual(loaded, thresholds)
+
+        main.engine_profile = loaded
+        for cipher_type in main.CIPHER_ENGINES:
+            for direction in ("encode", "decode"):
+                for length in (0, 8, 64, 1000):
+                    expected = [engine for min_length, engine in loaded[cipher_type][direction] if length >= min_length][-1]
+                    self.assertEqual(main.select_engine(cipher_type, direction, length), expected)
+
+    def test_encode_text_without_profile_does_not_calibrate(self):
+        main.engine_profile = None
+        main.engine_profile_loaded = False
+        with mock.patch.object(main, "load_engine_profile", return_value=None), \
+                mock.patch.object(main, "calibrate_engines", side_effect=AssertionError("calibrated")):
+            self.assertEqual(main.select_engine("caesar", "encode", 1), main.UNCALIBRATED_ENGINES["caesar"])
+            self.assertEqual(main.select_engine("vigenere", "encode", 1), main.DEFAULT_ENGINE)
+            self.assertEqual(main.encode_text("caesar", "abc", shift=1), "bcd")
+
+    def test_pinned_engine(self):
+        main.pin_engine("table")
+        self.assertEqual(main.select_engine("caesar", "encode", 1), "table")
+        self.assertEqual(main.select_engine("vigenere", "encode", 1), "loop")
+        with self.assertRaises(ValueError):
+            main.pin_engine("simd")
+
+
+def eager_chain(text, cipher_keys, direction="encode"):
+    for cipher_key in cipher_keys:
+        text = main.ciphers[cipher_key][direction](text)
+    return text
+
+
+class ReversalViewTest(unittest.TestCase):
+    REVERSALS = sorted(main.LAZY_REVERSAL_CIPHERS)
+    CASES = [
+        ("", ["reverse_capitalize"]),
+        (" ", ["reverse_capitalize", "reverse_word_order"]),
+        ("hello world", ["reverse_capitalize"]),
+        ("hello world", ["reverse_word_order", "reverse_capitalize"]),
+        ("hello world", ["reverse_chars_in_words", "reverse_capitalize"]),
+        ("hello world", ["reverse_capitalize", "reverse_capitalize", "reverse_word_order"]),
+        (" leading", ["reverse_word_order", "reverse_capitalize"]),
+        ("trailing ", ["reverse_capitalize", "reverse_chars_in_words"]),
+        ("double  space", ["reverse_capitalize", "reverse_word_order", "reverse_capitalize"]),
+        ("abc ß", ["reverse_capitalize", "reverse_word_order"]),
+        ("ßa bc", ["reverse_word_order", "reverse_capitalize", "reverse_capitalize"]),
+        ("ǆ x", ["reverse_word_order", "reverse_capitalize", "reverse_chars_in_words"]),
+    ]
+
+    def test_cases_match_eager_ciphers(self):
+        for text, cipher_keys in self.CASES:
+            for direction in ("encode", "decode"):
+                with self.subTest(text=text, cipher_keys=cipher_keys, direction=direction):
+                    steps = [(cipher_key, {}) for cipher_key in cipher_keys]
+                    self.assertEqual(main.run_cipher_chain(text, steps, decode=direction == "decode"),
+                                     eager_chain(text, cipher_keys, direction))
+
+    def test_first_index(self):
+        self.assertEqual(main.ReversalView("ab cd").first_index(), 0)
+        self.assertEqual(main.ReversalView("ab cd").reverse_words().first_index(), 3)
+        self.assertEqual(main.ReversalView("ab cd").reverse_chars_in_words().first_index(), 1)
+        self.assertEqual(main.ReversalView("ab cd").reverse().first_index(), 4)
+        self.assertIsNone(main.ReversalView(" ab").first_index())
+        self.assertIsNone(main.ReversalView("").first_index())
+
+    def test_mixed_chains_match_eager_ciphers(self):
+        rng = random.Random(1234)
+        cipher_keys = self.REVERSALS + ["atbash", "block_reverse", "caesar"]
+        for _ in range(2000):
+            text = "".join(rng.choice("ab C ßǆ1é ") for _ in range(rng.randint(0, 15)))
+            pool = cipher_keys if rng.random() < 0.2 else self.REVERSALS
+            chain = [rng.choice(pool) for _ in range(rng.randint(1, 6))]
+            for direction in ("encode", "decode"):
+                steps = [(cipher_key, {}) for cipher_key in chain]
+                self.assertEqual(main.run_cipher_chain(text, steps, decode=direction == "decode"),
+                                 eager_chain(text, chain, direction), (text, chain, direction))
+
+    def test_on_step_sees_every_intermediate_text(self):
+        chain = ["reverse_word_order", "reverse_capitalize", "caesar"]
+        seen = []
+        result = main.run_cipher_chain("one two", [(cipher_key, {}) for cipher_key in chain],
+                                       on_step=lambda i, cipher_key, text: seen.append(text))
+        self.assertEqual(seen, [eager_chain("one two", chain[:i]) for i in range(1, 4)])
+        self.assertEqual(result, seen[-1])
+
+    def test_failing_step_reports_partial_text(self):
+        steps = [("reverse_word_order", {}), ("atbash", {}), ("hex_encode", {})]
+        with self.assertRaises(main.CipherChainError) as cm:
+            main.run_cipher_chain("ab cde", steps, decode=True)
+        self.assertEqual(cm.exception.step, 3)
+        self.assertEqual(cm.exception.cipher_key, "hex_encode")
+        self.assertEqual(cm.exception.text, "xwv zy")
+        self.assertIsInstance(cm.exception.error, ValueError)
+
+    def test_word_replacement_requires_replacements(self):
+        with self.assertRaises(main.CipherChainError) as cm:
+            main.run_cipher_chain("hello world", [("word_replacement", {})])
+        self.assertIsInstance(cm.exception.error, ValueError)
+
+        replacements = {}
+        encoded = main.run_cipher_chain("hello world", [("word_replacement", {"replacements": replacements})])
+        self.assertEqual(set(replacements), {"hello", "world"})
+        decoded = main.run_cipher_chain(encoded, [("word_replacement", {"replacements": replacements})], decode=True)
+        self.assertEqual(decoded, "hello world")
+
+
+if __name__ == "__main__":
+    unittest.main()